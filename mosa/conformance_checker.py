@@ -0,0 +1,267 @@
+import os
+import re
+import sys
+import json
+import argparse
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+from file_selector import main_file_selector
+from flowchart_visualizer import parse_mermaid_flowchart
+from markdown_scanner import HEADING_PATTERN, scan_lines
+
+# md-table-formatter.py has a hyphen in its name, so load it by path
+_formatter_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'md-table-formatter.py')
+_formatter_spec = importlib.util.spec_from_file_location('md_table_formatter', _formatter_path)
+md_table_formatter = importlib.util.module_from_spec(_formatter_spec)
+_formatter_spec.loader.exec_module(md_table_formatter)
+format_markdown_table = md_table_formatter.format_markdown_table
+
+# Default rule set, taken from the "must contain" items in TODO.md.
+# Rule types:
+#   heading       - some heading matches 'pattern'
+#   text          - some line outside code blocks matches 'pattern'
+#   diagram_table - every mermaid node label appears in a table row
+DEFAULT_RULES = [
+    {'id': 'module-definitions', 'type': 'heading', 'pattern': r'\bmodules?\b',
+     'description': 'Define all system modules with specifications'},
+    {'id': 'physical-interfaces', 'type': 'heading', 'pattern': r'\b(hardware|physical)\b.*\binterfaces?\b',
+     'description': 'Document physical interfaces'},
+    {'id': 'software-interfaces', 'type': 'heading', 'pattern': r'\bsoftware\b.*\binterfaces?\b|\bapi\b',
+     'description': 'Document software interfaces'},
+    {'id': 'protocols', 'type': 'text', 'pattern': r'\bprotocols?\b',
+     'description': 'Specify communication protocols used'},
+    {'id': 'message-formats', 'type': 'heading', 'pattern': r'\bmessage formats?\b',
+     'description': 'Document message formats and structures'},
+    {'id': 'security-architecture', 'type': 'heading', 'pattern': r'\bsecurity architecture\b',
+     'description': 'Expand security architecture section'},
+    {'id': 'configuration-management', 'type': 'heading', 'pattern': r'\bconfiguration management\b',
+     'description': 'Add configuration management procedures'},
+    {'id': 'conformance-testing', 'type': 'heading', 'pattern': r'\bconformance\b',
+     'description': 'Add conformance testing procedures'},
+    {'id': 'table-of-contents', 'type': 'heading', 'pattern': r'\btable of contents\b',
+     'description': 'Add table of contents'},
+    {'id': 'version-history', 'type': 'heading', 'pattern': r'\bversion history\b|\brevision history\b',
+     'description': 'Include version history'},
+    {'id': 'glossary', 'type': 'heading', 'pattern': r'\bglossary\b',
+     'description': 'Add glossary of technical terms'},
+    {'id': 'diagram-nodes-in-tables', 'type': 'diagram_table',
+     'description': 'Every diagram node has an interface table row'},
+]
+
+# Rules compiled once per process (see init_rules)
+_compiled_rules = None
+
+def load_rules(rules_file=None):
+    """Load rule definitions from a JSON file, or return the default rules"""
+    if not rules_file:
+        return DEFAULT_RULES
+    with open(rules_file, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+def compile_rules(rules):
+    """Compile rule patterns once so every document reuses them"""
+    if not isinstance(rules, list):
+        raise ValueError("Rule set must be a list of rules")
+    compiled = []
+    for position, rule in enumerate(rules, 1):
+        if not isinstance(rule, dict):
+            raise ValueError(f"Rule #{position} must be an object, not {type(rule).__name__}")
+        rule_id = rule.get('id', f'#{position}')
+        required = ['id', 'type', 'description']
+        if rule.get('type') != 'diagram_table':
+            required.append('pattern')
+        missing = [key for key in required if key not in rule]
+        if missing:
+            raise ValueError(f"Rule '{rule_id}' is missing required field(s): {', '.join(missing)}")
+        if rule['type'] not in ('heading', 'text', 'diagram_table'):
+            raise ValueError(f"Unknown rule type '{rule['type']}' in rule '{rule_id}'")
+        compiled_rule = dict(rule)
+        if rule['type'] != 'diagram_table':
+            try:
+                compiled_rule['regex'] = re.compile(rule['pattern'], re.IGNORECASE)
+            except (re.error, TypeError) as e:
+                raise ValueError(f"Rule '{rule_id}' has an invalid pattern: {e}")
+        compiled.append(compiled_rule)
+    return compiled
+
+def init_rules(rules):
+    """Compile rules for the current process (used as the pool initializer)"""
+    global _compiled_rules
+    _compiled_rules = compile_rules(rules)
+
+def table_rows(table_text):
+    """Split a table into rows of cells using format_markdown_table's layout"""
+    rows = []
+    for line in format_markdown_table(table_text).split('\n'):
+        if line.startswith('|-'):
+            continue
+        rows.append([cell.strip() for cell in line.strip().strip('|').split('|')])
+    return rows
+
+def normalize_cell(text):
+    """Normalize a table cell or node label for comparison"""
+    return ' '.join(re.sub(r'[*`]', '', text).lower().split())
+
+def check_diagram_tables(diagrams, tables):
+    """Return the diagram nodes whose label is not a cell of any table row"""
+    cells = set()
+    for table_text in tables:
+        for row in table_rows(table_text):
+            for cell in row:
+                cells.add(normalize_cell(cell))
+
+    missing = []
+    for diagram_line, mermaid_text in diagrams:
+        nodes, _ = parse_mermaid_flowchart(mermaid_text)
+        for node_id, node_label in nodes.items():
+            label = normalize_cell(node_label)
+            if not label or label not in cells:
+                missing.append({'node': node_id, 'label': node_label, 'diagram_line': diagram_line})
+    return missing
+
+def check_document(file_path, rules=None):
+    """Evaluate all rules against a document in a single pass over its lines
+
+    Without 'rules' the rules compiled by init_rules are used (the pool path),
+    falling back to the default rules.
+    """
+    if rules is not None:
+        rules = compile_rules(rules)
+    elif _compiled_rules is not None:
+        rules = _compiled_rules
+    else:
+        rules = compile_rules(DEFAULT_RULES)
+
+    heading_rules = [rule for rule in rules if rule['type'] == 'heading']
+    text_rules = [rule for rule in rules if rule['type'] == 'text']
+    matches = {}
+    diagrams = []
+    tables = []
+    table_lines = []
+
+    def flush_table():
+        if len(table_lines) >= 2:
+            tables.append('\n'.join(table_lines))
+        table_lines.clear()
+
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for kind, line_number, line in scan_lines(file):
+            if kind == 'mermaid':
+                diagrams.append((line_number, line))
+                continue
+            if kind == 'fence':
+                flush_table()
+                continue
+
+            # Same table detection as process_file_for_tables
+            if '|' in line and line.count('|') >= 3:
+                table_lines.append(line)
+            else:
+                flush_table()
+
+            heading_match = HEADING_PATTERN.match(line)
+            if heading_match:
+                # Only rules not yet satisfied are tested
+                for rule in heading_rules:
+                    if rule['id'] not in matches and rule['regex'].search(heading_match.group(2).strip()):
+                        matches[rule['id']] = line_number
+            for rule in text_rules:
+                if rule['id'] not in matches and rule['regex'].search(line):
+                    matches[rule['id']] = line_number
+    flush_table()
+
+    results = []
+    for rule in rules:
+        result = {'id': rule['id'], 'description': rule['description']}
+        if rule['type'] == 'diagram_table':
+            missing = check_diagram_tables(diagrams, tables)
+            result['passed'] = not missing
+            result['missing'] = missing
+        else:
+            result['passed'] = rule['id'] in matches
+            result['line'] = matches.get(rule['id'])
+        results.append(result)
+
+    return {
+        'file': str(file_path),
+        'passed': all(result['passed'] for result in results),
+        'rules': results
+    }
+
+def check_file(file_path):
+    """Check one document, reporting read errors in its result instead of raising"""
+    try:
+        return check_document(file_path)
+    except (OSError, UnicodeDecodeError) as e:
+        return {'file': str(file_path), 'passed': False, 'error': str(e)}
+
+def check_files(file_paths, rules=None, workers=None):
+    """Check several documents in parallel and build the conformance report"""
+    if rules is None:
+        rules = DEFAULT_RULES
+    file_paths = [str(file_path) for file_path in file_paths]
+
+    # Validate the rule set before any worker process starts
+    compile_rules(rules)
+
+    if len(file_paths) <= 1:
+        init_rules(rules)
+        documents = [check_file(file_path) for file_path in file_paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_rules, initargs=(rules,)) as executor:
+            documents = list(executor.map(check_file, file_paths))
+
+    failed = [document['file'] for document in documents if not document['passed']]
+    return {
+        'summary': {
+            'files': len(documents),
+            'passed': len(documents) - len(failed),
+            'failed': len(failed)
+        },
+        'documents': documents
+    }
+
+def main():
+    """Main function for MOSA conformance checker"""
+    parser = argparse.ArgumentParser(description='Check MOSA documents against the conformance rules')
+    parser.add_argument('files', nargs='*', help='markdown files to check (interactive selection if omitted)')
+    parser.add_argument('--rules', help='JSON file with the rule set (defaults to the TODO.md rules)')
+    parser.add_argument('--output', help='write the JSON report to this file instead of stdout')
+    parser.add_argument('--workers', type=int, help='number of parallel worker processes')
+    args = parser.parse_args()
+
+    if args.files:
+        selected_files = args.files
+    else:
+        print("=== MOSA Conformance Checker ===")
+        selected_files = main_file_selector()
+
+    if not selected_files:
+        print("No files selected for checking.")
+        return 0
+
+    try:
+        rules = load_rules(args.rules)
+    except OSError as e:
+        print(f"✗ Could not read rule set: {e}")
+        return 2
+
+    try:
+        report = check_files(selected_files, rules, args.workers)
+    except ValueError as e:
+        print(f"✗ Invalid rule set: {e}")
+        return 2
+    report_json = json.dumps(report, indent=2, ensure_ascii=False)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(report_json)
+        summary = report['summary']
+        print(f"✓ Wrote report: {args.output} ({summary['passed']}/{summary['files']} files passed)")
+    else:
+        print(report_json)
+
+    return 1 if report['summary']['failed'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,369 @@
+import os
+import re
+import json
+import hashlib
+import unicodedata
+from urllib.parse import quote
+from file_selector import main_file_selector, list_markdown_files
+from flowchart_visualizer import parse_mermaid_flowchart
+from markdown_scanner import HEADING_PATTERN, scan_lines
+
+CACHE_FILE_NAME = ".mosa_index_cache.json"
+CACHE_VERSION = 1
+TOC_FILE_NAME = "MOSA_TOC.md"
+CROSS_REFERENCE_FILE_NAME = "MOSA_CROSS_REFERENCE.md"
+INDEX_SUFFIX = "&index"
+
+ANCHOR_COUNT_PATTERN = re.compile(r'^(.*)_([0-9]+)$')
+ANCHOR_PATTERN = re.compile(r'<a\s+(?:id|name)="([^"]+)"|\{#([A-Za-z0-9_-]+)\}')
+MODULE_ID_PATTERN = re.compile(r'\*\*Module ID\*\*:\s*([A-Za-z0-9_-]+)')
+GLOSSARY_ITEM_PATTERN = re.compile(r'^[-*]\s+\*\*([^*]+)\*\*\s*[:\-–]')
+
+def slugify(value, separator='-'):
+    """Slugify a heading the same way as the markdown 'toc' extension"""
+    value = unicodedata.normalize('NFKD', value).encode('ascii', 'ignore').decode('ascii')
+    value = re.sub(r'[^\w\s-]', '', value).strip().lower()
+    return re.sub(r'[{}\s]+'.format(separator), separator, value)
+
+def unique_anchor(anchor, used_anchors):
+    """Make an anchor unique within a document like the 'toc' extension does"""
+    while anchor in used_anchors or not anchor:
+        count_match = ANCHOR_COUNT_PATTERN.match(anchor)
+        if count_match:
+            anchor = f"{count_match.group(1)}_{int(count_match.group(2)) + 1}"
+        else:
+            anchor = f"{anchor}_1"
+    used_anchors.add(anchor)
+    return anchor
+
+def plain_text(text):
+    """Strip inline markdown formatting (links, emphasis, code) from heading text"""
+    text = re.sub(r'\[([^\]]*)\]\([^)]*\)', r'\1', text)
+    text = re.sub(r'`([^`]*)`', r'\1', text)
+    text = re.sub(r'(\*\*|__)(?=\S)(.+?)(?<=\S)\1', r'\2', text)
+    # Underscores inside words are literal, as in Python-Markdown
+    text = re.sub(r'\*(?=\S)(.+?)(?<=\S)\*', r'\1', text)
+    text = re.sub(r'(?<!\w)_(?=\S)(.+?)(?<=\S)_(?!\w)', r'\1', text)
+    return text.strip()
+
+def file_hash(file_path):
+    """Return the SHA-256 of a file's contents"""
+    with open(file_path, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+def extract_entries(file_path):
+    """Extract headings, anchors, glossary terms and module names from a document"""
+    headings = []
+    entries = []
+    used_anchors = set()
+    current_anchor = ''
+    in_glossary = False
+
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for kind, line_number, line in scan_lines(file):
+            if kind == 'mermaid':
+                nodes, _ = parse_mermaid_flowchart(line)
+                for node_label in nodes.values():
+                    entries.append({'term': node_label, 'kind': 'module',
+                                    'anchor': current_anchor, 'line': line_number})
+                continue
+            if kind == 'fence':
+                continue
+            stripped = line.strip()
+
+            heading_match = HEADING_PATTERN.match(line)
+            if heading_match:
+                text = plain_text(heading_match.group(2))
+                current_anchor = unique_anchor(slugify(text), used_anchors)
+                in_glossary = 'glossary' in text.lower()
+                headings.append({'level': len(heading_match.group(1)), 'text': text,
+                                 'anchor': current_anchor, 'line': line_number})
+                entries.append({'term': text, 'kind': 'heading',
+                                'anchor': current_anchor, 'line': line_number})
+                continue
+
+            for anchor_match in ANCHOR_PATTERN.finditer(line):
+                anchor = anchor_match.group(1) or anchor_match.group(2)
+                entries.append({'term': anchor, 'kind': 'anchor', 'anchor': anchor, 'line': line_number})
+
+            module_match = MODULE_ID_PATTERN.search(line)
+            if module_match:
+                entries.append({'term': module_match.group(1), 'kind': 'module',
+                                'anchor': current_anchor, 'line': line_number})
+
+            if in_glossary:
+                term = None
+                glossary_match = GLOSSARY_ITEM_PATTERN.match(stripped)
+                if glossary_match:
+                    term = glossary_match.group(1)
+                elif stripped.startswith('|') and not re.match(r'^\|[\s:|-]*$', stripped):
+                    term = stripped.strip('|').split('|')[0].strip()
+                if term and term.lower() not in ('term', 'acronym'):
+                    entries.append({'term': term.strip(), 'kind': 'glossary',
+                                    'anchor': current_anchor, 'line': line_number})
+
+    return {'headings': headings, 'entries': entries}
+
+def load_cache(cache_path):
+    """Load the index cache, or return an empty one"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as file:
+            cache = json.load(file)
+        if cache.get('version') == CACHE_VERSION:
+            return cache
+    except (OSError, ValueError):
+        pass
+    return {'version': CACHE_VERSION, 'files': {}, 'index': {}}
+
+def save_cache(cache, cache_path):
+    """Write the index cache to disk"""
+    with open(cache_path, 'w', encoding='utf-8') as file:
+        json.dump(cache, file, ensure_ascii=False)
+
+def remove_postings(index, file_key, entries):
+    """Remove a file's postings from the inverted index"""
+    for term_key in {entry['term'].lower() for entry in entries}:
+        postings = [posting for posting in index.get(term_key, []) if posting['file'] != file_key]
+        if postings:
+            index[term_key] = postings
+        else:
+            index.pop(term_key, None)
+
+def add_postings(index, file_key, entries):
+    """Add a file's postings to the inverted index"""
+    for entry in entries:
+        posting = dict(entry, file=file_key)
+        index.setdefault(entry['term'].lower(), []).append(posting)
+
+def is_generated_file(file_path):
+    """Return True for files written by this tool"""
+    file_name = os.path.basename(str(file_path))
+    name, _ = os.path.splitext(file_name)
+    return file_name in (TOC_FILE_NAME, CROSS_REFERENCE_FILE_NAME) or name.endswith(INDEX_SUFFIX)
+
+def corpus_files(selected_files):
+    """Return the source markdown files in the directories of the selected files
+
+    Derived copies such as 'name&table_format.md' are left out when their
+    source 'name.md' is present, unless they were selected explicitly.
+    """
+    selected = {os.path.abspath(str(file_path)) for file_path in selected_files}
+    directories = {os.path.dirname(file_path) for file_path in selected}
+    candidates = {os.path.abspath(str(file_path))
+                  for directory in directories for file_path in list_markdown_files(directory)}
+
+    corpus = []
+    for file_path in sorted(candidates | selected):
+        if is_generated_file(file_path):
+            continue
+        name, ext = os.path.splitext(os.path.basename(file_path))
+        source = os.path.join(os.path.dirname(file_path), name.split('&')[0] + ext)
+        if file_path not in selected and source != file_path and source in candidates:
+            continue
+        corpus.append(file_path)
+    return corpus
+
+def update_index(file_paths, cache_path=None):
+    """Update the inverted index for the given corpus, re-indexing only changed files"""
+    # Generated pages and indexed copies are outputs, not part of the corpus
+    file_paths = [os.path.abspath(str(file_path)) for file_path in file_paths
+                  if not is_generated_file(file_path)]
+    if cache_path is None:
+        corpus_dir = os.path.commonpath([os.path.dirname(path) for path in file_paths]) if file_paths else '.'
+        cache_path = os.path.join(corpus_dir, CACHE_FILE_NAME)
+
+    cache = load_cache(cache_path)
+    files = cache['files']
+    index = cache['index']
+    reindexed = []
+    removed = [key for key in files if not os.path.isfile(key)]
+
+    # Files deleted from disk drop out of the index; files outside the
+    # current selection keep their postings
+    for file_key in removed:
+        remove_postings(index, file_key, files[file_key]['entries'])
+        del files[file_key]
+
+    for file_path in file_paths:
+        digest = file_hash(file_path)
+        cached = files.get(file_path)
+        if cached and cached['hash'] == digest:
+            continue
+
+        if cached:
+            remove_postings(index, file_path, cached['entries'])
+        extracted = extract_entries(file_path)
+        add_postings(index, file_path, extracted['entries'])
+        files[file_path] = {'hash': digest, **extracted}
+        reindexed.append(file_path)
+
+    if reindexed or removed:
+        save_cache(cache, cache_path)
+
+    # The cache keeps every file indexed so far; callers only see this corpus
+    corpus = set(file_paths)
+    corpus_index = {}
+    for term_key, postings in index.items():
+        corpus_postings = [posting for posting in postings if posting['file'] in corpus]
+        if corpus_postings:
+            corpus_index[term_key] = corpus_postings
+
+    return {
+        'files': {file_path: files[file_path] for file_path in file_paths},
+        'index': corpus_index,
+        'reindexed': reindexed
+    }
+
+def file_link(file_key, anchor, base_dir):
+    """Build a relative markdown link target to an anchor in another file"""
+    target = quote(os.path.relpath(file_key, base_dir).replace(os.sep, '/'))
+    return f"{target}#{anchor}" if anchor else target
+
+def generate_toc_page(index, base_dir):
+    """Generate the corpus-wide table of contents page"""
+    lines = ["# Table of Contents", ""]
+    for file_key in sorted(index['files']):
+        file_name = os.path.basename(file_key)
+        lines.append(f"## [{file_name}]({file_link(file_key, '', base_dir)})")
+        lines.append("")
+        for heading in index['files'][file_key]['headings']:
+            indent = '  ' * (heading['level'] - 1)
+            lines.append(f"{indent}- [{heading['text']}]({file_link(file_key, heading['anchor'], base_dir)})")
+        lines.append("")
+    return '\n'.join(lines)
+
+def generate_cross_reference_page(index, base_dir):
+    """Generate the corpus-wide cross-reference index page"""
+    sections = [('module', 'Modules'), ('glossary', 'Glossary Terms'), ('anchor', 'Anchors')]
+    lines = ["# Cross-Reference Index", ""]
+    for kind, title in sections:
+        terms = {}
+        for postings in index['index'].values():
+            for posting in postings:
+                if posting['kind'] == kind:
+                    terms.setdefault(posting['term'], []).append(posting)
+        if not terms:
+            continue
+
+        lines.append(f"## {title}")
+        lines.append("")
+        for term in sorted(terms, key=str.lower):
+            locations = ', '.join(
+                f"[{os.path.basename(posting['file'])}:{posting['line']}]"
+                f"({file_link(posting['file'], posting['anchor'], base_dir)})"
+                for posting in terms[term]
+            )
+            lines.append(f"- **{term}**: {locations}")
+        lines.append("")
+    return '\n'.join(lines)
+
+def write_index_pages(index, output_dir):
+    """Write the TOC and cross-reference pages next to the documents"""
+    pages = {
+        TOC_FILE_NAME: generate_toc_page(index, output_dir),
+        CROSS_REFERENCE_FILE_NAME: generate_cross_reference_page(index, output_dir)
+    }
+    written = []
+    for page_name, content in pages.items():
+        page_path = os.path.join(output_dir, page_name)
+        with open(page_path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        written.append(page_path)
+    return written
+
+def inject_index(md_content, file_path, index):
+    """Insert a document TOC after the title and append its cross-references"""
+    file_key = os.path.abspath(str(file_path))
+    file_entry = index['files'].get(file_key)
+    if not file_entry:
+        return md_content
+
+    # A document that already has these sections keeps its own; injecting a
+    # second one would also shift the existing section's anchor
+    existing_anchors = {heading['anchor'] for heading in file_entry['headings']}
+
+    toc_lines = ["## Table of Contents", ""]
+    for heading in file_entry['headings']:
+        if heading['level'] == 1:
+            continue
+        indent = '  ' * (heading['level'] - 2)
+        toc_lines.append(f"{indent}- [{heading['text']}](#{heading['anchor']})")
+
+    # Terms from this document that also appear elsewhere in the corpus
+    xref_lines = []
+    seen_terms = set()
+    for entry in file_entry['entries']:
+        term_key = entry['term'].lower()
+        if entry['kind'] == 'heading' or term_key in seen_terms:
+            continue
+        seen_terms.add(term_key)
+        others = [posting for posting in index['index'].get(term_key, []) if posting['file'] != file_key]
+        if others:
+            locations = ', '.join(
+                f"[{os.path.basename(posting['file'])}:{posting['line']}]"
+                f"({file_link(posting['file'], posting['anchor'], os.path.dirname(file_key))})"
+                for posting in others
+            )
+            term = f"[**{entry['term']}**](#{entry['anchor']})" if entry['anchor'] else f"**{entry['term']}**"
+            xref_lines.append(f"- {term}: {locations}")
+
+    lines = md_content.split('\n')
+    if 'table-of-contents' not in existing_anchors:
+        # Right after the title, or at the top when there is none
+        titles = [heading['line'] for heading in file_entry['headings'] if heading['level'] == 1]
+        insert_at = titles[0] if titles else 0
+        lines[insert_at:insert_at] = [""] + toc_lines + [""]
+
+    if xref_lines and 'cross-reference-index' not in existing_anchors:
+        lines.extend(["", "## Cross-Reference Index", ""] + xref_lines)
+
+    return '\n'.join(lines)
+
+def process_file_for_index(file_path, index, output_suffix=INDEX_SUFFIX):
+    """Write a copy of a markdown file with its TOC and cross-references injected"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            content = file.read()
+
+        file_dir = os.path.dirname(file_path)
+        file_name = os.path.basename(file_path)
+        name, ext = os.path.splitext(file_name)
+        output_file = os.path.join(file_dir, f"{name}{output_suffix}{ext}")
+
+        with open(output_file, 'w', encoding='utf-8') as file:
+            file.write(inject_index(content, file_path, index))
+
+        print(f"✓ Created indexed version: {output_file}")
+        return True
+
+    except Exception as e:
+        print(f"✗ Error processing {file_path}: {e}")
+        return False
+
+def main():
+    """Main function for cross-reference indexer"""
+    print("=== MOSA Cross-Reference Indexer ===")
+    selected_files = main_file_selector()
+
+    if not selected_files:
+        print("No files selected for processing.")
+        return
+
+    # Same corpus as md2pdf, so both tools produce the same cross-references
+    index = update_index(corpus_files(selected_files))
+    print(f"\nIndexed {len(index['files'])} file(s), re-indexed {len(index['reindexed'])} changed file(s).")
+
+    output_dir = os.path.dirname(os.path.abspath(str(selected_files[0])))
+    for page_path in write_index_pages(index, output_dir):
+        print(f"✓ Created index page: {page_path}")
+
+    inject_choice = input("Write copies of the documents with TOC and cross-references? (y/n, default=n): ").strip().lower()
+    if inject_choice in ['y', 'yes']:
+        processed = 0
+        for file_path in selected_files:
+            if process_file_for_index(str(file_path), index):
+                processed += 1
+        print(f"\nCompleted! Processed {processed}/{len(selected_files)} files.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import re
+
+# Python-Markdown only treats '#' in the first column as a heading
+HEADING_PATTERN = re.compile(r'^(#{1,6})(.*?)#*\s*$')
+
+def scan_lines(lines):
+    """Walk markdown lines, tracking fenced code and mermaid blocks
+
+    Yields (kind, line_number, value) tuples:
+        'text'    - a line outside any fenced block
+        'fence'   - a fenced block (code or mermaid) starts on this line
+        'mermaid' - a mermaid block ended; value is its content and
+                    line_number the line of its opening fence
+    Lines inside fenced blocks are not yielded as text.
+    """
+    in_code_block = False
+    in_mermaid_block = False
+    mermaid_content = []
+    mermaid_start = 0
+
+    for line_number, line in enumerate(lines, 1):
+        line = line.rstrip('\n')
+        stripped = line.strip()
+
+        if in_mermaid_block:
+            if stripped == '```':
+                yield 'mermaid', mermaid_start, '\n'.join(mermaid_content)
+                in_mermaid_block = False
+            else:
+                mermaid_content.append(line)
+            continue
+        if in_code_block:
+            if stripped.startswith('```'):
+                in_code_block = False
+            continue
+        if stripped == '```mermaid':
+            in_mermaid_block = True
+            mermaid_content = []
+            mermaid_start = line_number
+            yield 'fence', line_number, line
+            continue
+        if stripped.startswith('```'):
+            in_code_block = True
+            yield 'fence', line_number, line
+            continue
+
+        yield 'text', line_number, line
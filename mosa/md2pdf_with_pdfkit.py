@@ -3,14 +3,19 @@ import pdfkit
 import os
 from pathlib import Path
 from file_selector import main_file_selector
+from cross_reference_index import update_index, inject_index, corpus_files
 
-def convert_md_to_pdf_simple(md_file_path, custom_css=None):
+def convert_md_to_pdf_simple(md_file_path, custom_css=None, index=None):
     """Convert Markdown to PDF using pdfkit (wkhtmltopdf)"""
     
     # Read markdown file
     with open(md_file_path, 'r', encoding='utf-8') as file:
         md_content = file.read()
     
+    # Add TOC and cross-references from the corpus index
+    if index:
+        md_content = inject_index(md_content, md_file_path, index)
+    
     # Convert MD to HTML
     html_content = markdown.markdown(md_content, extensions=['tables', 'fenced_code', 'toc'])
     
@@ -133,7 +138,7 @@ def convert_md_to_pdf_simple(md_file_path, custom_css=None):
         print("Make sure wkhtmltopdf is installed on your system!")
         return None
 
-def batch_convert_md_to_pdf(selected_files):
+def batch_convert_md_to_pdf(selected_files, include_index=False):
     """Convert selected markdown files to PDF"""
     
     if not selected_files:
@@ -143,8 +148,12 @@ def batch_convert_md_to_pdf(selected_files):
     print(f"\nConverting {len(selected_files)} file(s) to PDF...")
     pdf_files = []
     
+    # Index covers every document next to the selection, so cross-references
+    # reach the whole corpus; unchanged files come from the cache
+    index = update_index(corpus_files(selected_files)) if include_index else None
+    
     for md_file in selected_files:
-        pdf_file = convert_md_to_pdf_simple(str(md_file))
+        pdf_file = convert_md_to_pdf_simple(str(md_file), index=index)
         if pdf_file:
             pdf_files.append(pdf_file)
     
@@ -171,7 +180,8 @@ def main():
     confirm = input(f"\nConvert these {len(selected_files)} files to PDF? (y/n): ").strip().lower()
     
     if confirm in ['y', 'yes']:
-        batch_convert_md_to_pdf(selected_files)
+        index_choice = input("Add table of contents and cross-reference index? (y/n, default=n): ").strip().lower()
+        batch_convert_md_to_pdf(selected_files, include_index=index_choice in ['y', 'yes'])
         print("\nPDF conversion completed!")
     else:
         print("PDF conversion cancelled.")
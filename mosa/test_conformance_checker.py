@@ -0,0 +1,75 @@
+import pytest
+from conformance_checker import check_document, check_files, compile_rules
+
+HEADING_RULES = [
+    {'id': 'glossary', 'type': 'heading', 'pattern': r'\bglossary\b', 'description': 'Glossary'},
+    {'id': 'version-history', 'type': 'heading', 'pattern': r'\bversion history\b', 'description': 'Version history'},
+]
+DIAGRAM_RULES = [
+    {'id': 'diagram-nodes-in-tables', 'type': 'diagram_table', 'description': 'Diagram nodes in tables'},
+]
+
+def write(path, content):
+    path.write_text(content, encoding='utf-8')
+    return str(path)
+
+def results_by_id(document):
+    return {result['id']: result for result in document['rules']}
+
+def test_heading_rules_pass_and_fail(tmp_path):
+    path = write(tmp_path / 'doc.md', "# Doc\n\n## Glossary\n\n- **MTBF**: mean time\n")
+    results = results_by_id(check_document(path, HEADING_RULES))
+
+    assert results['glossary']['passed']
+    assert results['glossary']['line'] == 3
+    assert not results['version-history']['passed']
+
+def test_headings_in_code_blocks_are_ignored(tmp_path):
+    content = "# Doc\n\n```bash\n# Glossary\n```\n\n   # Version history\n"
+    path = write(tmp_path / 'doc.md', content)
+    results = results_by_id(check_document(path, HEADING_RULES))
+
+    assert not results['glossary']['passed']
+    assert not results['version-history']['passed']
+
+def test_diagram_nodes_need_whole_table_cells(tmp_path):
+    content = (
+        "```mermaid\ngraph TD\n    A[IMU] --> B[Bus]\n    B --> C[Radar]\n    C --> X[]\n```\n\n"
+        "| Module | Interface |\n|--------|-----------|\n| Simulation | Bus stop |\n| **Radar** | Ethernet |\n"
+    )
+    path = write(tmp_path / 'doc.md', content)
+    result = results_by_id(check_document(path, DIAGRAM_RULES))['diagram-nodes-in-tables']
+
+    assert not result['passed']
+    assert [node['node'] for node in result['missing']] == ['A', 'B', 'X']
+
+@pytest.mark.parametrize('rules, message', [
+    ({'id': 'x'}, 'must be a list'),
+    (['x'], 'must be an object'),
+    ([{'id': 'x', 'type': 'heading'}], 'missing required field(s): description, pattern'),
+    ([{'id': 'x', 'type': 'word', 'pattern': 'a', 'description': 'd'}], "Unknown rule type 'word'"),
+    ([{'id': 'x', 'type': 'heading', 'pattern': '(', 'description': 'd'}], "Rule 'x' has an invalid pattern"),
+])
+def test_invalid_rules_raise_value_error(rules, message):
+    with pytest.raises(ValueError) as error:
+        compile_rules(rules)
+    assert message in str(error.value)
+
+def test_check_files_in_parallel(tmp_path):
+    passing = write(tmp_path / 'passing.md', "## Glossary\n\n## Version History\n")
+    failing = write(tmp_path / 'failing.md', "## Glossary\n")
+    missing = str(tmp_path / 'missing.md')
+
+    report = check_files([passing, failing, missing], HEADING_RULES, workers=2)
+
+    assert report['summary'] == {'files': 3, 'passed': 1, 'failed': 2}
+    documents = {document['file']: document for document in report['documents']}
+    assert documents[passing]['passed']
+    assert not documents[failing]['passed']
+    assert not documents[missing]['passed']
+    assert 'error' in documents[missing]
+
+def test_empty_rule_set_is_not_replaced_by_defaults(tmp_path):
+    path = write(tmp_path / 'doc.md', "# Doc\n")
+    report = check_files([path], [])
+    assert report['documents'][0]['rules'] == []
@@ -0,0 +1,124 @@
+import glob
+import json
+import os
+import pytest
+from cross_reference_index import (update_index, extract_entries, inject_index, corpus_files,
+                                   process_file_for_index)
+
+SAMPLE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def write(path, content):
+    path.write_text(content, encoding='utf-8')
+    return str(path)
+
+def postings_for(index, file_key):
+    return sorted(
+        (term, posting['kind'], posting['line'])
+        for term, postings in index['index'].items()
+        for posting in postings if posting['file'] == file_key
+    )
+
+def toc_anchors(md_content):
+    """Return heading ids as rendered by the markdown 'toc' extension"""
+    markdown = pytest.importorskip('markdown')
+    md = markdown.Markdown(extensions=['tables', 'fenced_code', 'toc'])
+    md.convert(md_content)
+
+    anchors = []
+    def walk(tokens):
+        for token in tokens:
+            anchors.append(token['id'])
+            walk(token['children'])
+    walk(md.toc_tokens)
+    return anchors
+
+def test_single_file_edit_only_reindexes_that_file(tmp_path):
+    first = write(tmp_path / 'first.md', "# First\n\n- **Module ID**: FCM-001\n")
+    second = write(tmp_path / 'second.md', "# Second\n\n- **Module ID**: COMM-002\n")
+    cache_path = str(tmp_path / 'cache.json')
+
+    index = update_index([first, second], cache_path)
+    assert sorted(index['reindexed']) == [first, second]
+    second_postings = postings_for(index, second)
+
+    write(tmp_path / 'first.md', "# First\n\n## Added\n\n- **Module ID**: FCM-002\n")
+    index = update_index([first, second], cache_path)
+
+    assert index['reindexed'] == [first]
+    assert postings_for(index, second) == second_postings
+    assert 'fcm-001' not in index['index']
+    assert [posting['file'] for posting in index['index']['fcm-002']] == [first]
+
+def test_partial_selection_keeps_corpus_postings(tmp_path):
+    first = write(tmp_path / 'first.md', "# First\n")
+    second = write(tmp_path / 'second.md', "# Second\n")
+    cache_path = str(tmp_path / 'cache.json')
+
+    update_index([first, second], cache_path)
+    index = update_index([first], cache_path)
+    assert sorted(index['files']) == [first]
+    index = update_index([first, second], cache_path)
+    assert index['reindexed'] == []
+
+    os.remove(second)
+    update_index([first], cache_path)
+    with open(cache_path, 'r', encoding='utf-8') as file:
+        cache = json.load(file)
+    assert sorted(cache['files']) == [first]
+    assert 'second' not in cache['index']
+
+def test_anchors_match_markdown_toc(tmp_path):
+    content = (
+        "# Title\n\n"
+        "## The `MODULE_ID` field\n\n"
+        "## a_b _em_ __strong__ **bold**\n\n"
+        "## x_1\n\n## x_1\n\n## x\n\n## x\n\n"
+        "1. **Install**\n\n   # Load module configuration\n   mosaload --module FCM-001\n"
+    )
+    path = write(tmp_path / 'doc.md', content)
+    anchors = [heading['anchor'] for heading in extract_entries(path)['headings']]
+    assert anchors == toc_anchors(content)
+
+@pytest.mark.parametrize('sample', sorted(glob.glob(os.path.join(SAMPLE_DIR, 'mosa exemple*.md'))))
+def test_sample_anchors_match_markdown_toc(sample):
+    with open(sample, 'r', encoding='utf-8') as file:
+        content = file.read()
+    anchors = [heading['anchor'] for heading in extract_entries(sample)['headings']]
+    assert anchors == toc_anchors(content)
+
+def test_inject_index_keeps_existing_toc(tmp_path):
+    content = "# Doc\n\n## Table of Contents\n\n- [Overview](#overview)\n\n## Overview\n"
+    path = write(tmp_path / 'doc.md', content)
+    index = update_index([path], str(tmp_path / 'cache.json'))
+
+    injected = inject_index(content, path, index)
+    assert injected.count('Table of Contents') == 1
+    assert toc_anchors(injected) == ['doc', 'table-of-contents', 'overview']
+
+def test_corpus_skips_derived_and_indexed_copies(tmp_path):
+    source = write(tmp_path / 'doc.md', "# Doc\n\n- **Module ID**: FCM-001\n")
+    write(tmp_path / 'doc&table_format.md', "# Doc\n\n- **Module ID**: FCM-001\n")
+    write(tmp_path / 'doc&table_format_FC_visual.md', "# Doc\n\n- **Module ID**: FCM-001\n")
+    other = write(tmp_path / 'other.md', "# Other\n\n- **Module ID**: FCM-001\n")
+    cache_path = str(tmp_path / 'cache.json')
+
+    index = update_index(corpus_files([source]), cache_path)
+    assert process_file_for_index(source, index)
+    assert os.path.exists(tmp_path / 'doc&index.md')
+
+    assert corpus_files([source]) == [source, other]
+    index = update_index(corpus_files([source]), cache_path)
+    assert sorted(posting['file'] for posting in index['index']['fcm-001']) == [source, other]
+
+def test_inject_index_places_toc_after_title_and_links_other_files(tmp_path):
+    content = "```bash\n# not a title\n```\n\n#Title\n\n- **Module ID**: FCM-001\n\n## Overview\n"
+    path = write(tmp_path / 'doc.md', content)
+    other = write(tmp_path / 'other.md', "- **Module ID**: FCM-001\n")
+    index = update_index([path, other], str(tmp_path / 'cache.json'))
+
+    lines = inject_index(content, path, index).split('\n')
+    assert lines[4:8] == ['#Title', '', '## Table of Contents', '']
+    assert '- [**FCM-001**](#title): [other.md:1](other.md)' in lines
+
+    other_lines = inject_index("- **Module ID**: FCM-001\n", other, index).split('\n')
+    assert '- **FCM-001**: [doc.md:7](doc.md#title)' in other_lines